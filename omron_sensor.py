@@ -77,6 +77,8 @@ class OmronSensor(object):
         if conf.ENABLE_NODEEXPORTER and not os.path.isdir(conf.NODE_OUTPUT_DIR):
             logger.error("Could not open prom dir: {}".format(conf.NODE_OUTPUT_DIR))
             sys.exit(1)
+        if conf.ENABLE_ADAPTIVE and conf.FAST_SCAN_PERIOD < conf.WRITE_WAIT:
+            logger.warning("FAST_SCAN_PERIOD is shorter than WRITE_WAIT, scan period will be {} sec at least".format(conf.WRITE_WAIT))
         
         # Get serial connection
         self.conn = get_serial_connection()
@@ -125,6 +127,7 @@ class OmronSensor(object):
 
     def run(self):
         logger.info("Omron Sensor Started.")
+        scheduler = omron_sensor_util.AdaptiveScheduler(conf)
         
         try:
             # Read data
@@ -143,11 +146,15 @@ class OmronSensor(object):
                     perse_data = omron_sensor_util.perse_latest_data_short(data)
                 except IndexError:
                     logger.error("Sensor Data null or broken.")
-                    time.sleep(conf.SCAN_PERIOD - conf.WRITE_WAIT)
+                    time.sleep(max(scheduler.period - conf.WRITE_WAIT, 0))
                     continue
                 
+                # Decide next scan period
+                scan_period = scheduler.update(perse_data, time.monotonic())
+                
                 # Logging data
                 logger.info(perse_data)
+                logger.debug("Scan period: {}".format(scan_period))
                 
                 # Write csv
                 if conf.ENABLE_CSV:
@@ -156,7 +163,8 @@ class OmronSensor(object):
                 
                 # Register data for prometheus
                 if conf.ENABLE_NODEEXPORTER or conf.ENABLE_PUSHGATEWAY:
-                    registry = omron_sensor_util.write_prom_registry(perse_data)
+                    registry = omron_sensor_util.write_prom_registry(perse_data, scheduler.interval,
+                                                                     scheduler.count)
                 
                 # Output to prometheus
                 if conf.ENABLE_NODEEXPORTER:
@@ -180,7 +188,7 @@ class OmronSensor(object):
                     yield self.grpc_conn.get_value()
                 
                 # Wait for next scan
-                time.sleep(conf.SCAN_PERIOD - conf.WRITE_WAIT)
+                time.sleep(max(scan_period - conf.WRITE_WAIT, 0))
         
         except KeyboardInterrupt:
             logger.info("Stopped by keyboard input (ctrl-C)")
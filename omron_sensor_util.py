@@ -1,6 +1,6 @@
 import os, csv
 from datetime import datetime
-from prometheus_client import CollectorRegistry, Gauge
+from prometheus_client import CollectorRegistry, Gauge, Counter
 import configparser
 from socket import gethostname
 from logging import getLogger, FileHandler, Formatter
@@ -37,6 +37,32 @@ class Config():
         self.gRPC_SERVER = config["gRPC"]["gRPC_SERVER"]
         self.gRPC_TIMEOUT = config.getfloat("gRPC","gRPC_TIMEOUT")
         self.gRPC_STREAM = config.getboolean("gRPC","gRPC_STREAM")
+        # Adaptive scan (optional section, fixed SCAN_PERIOD when disabled)
+        self.ENABLE_ADAPTIVE = config.getboolean("ADAPTIVE","ENABLE_ADAPTIVE", fallback=False)
+        self.FAST_SCAN_PERIOD = config.getfloat("ADAPTIVE","FAST_SCAN_PERIOD", fallback=self.SCAN_PERIOD)
+        self.DECAY_FACTOR = config.getfloat("ADAPTIVE","DECAY_FACTOR", fallback=1.5)
+        self.VIBRATION_TRIGGER = config.getboolean("ADAPTIVE","VIBRATION_TRIGGER", fallback=True)
+        self.SOUND_NOISE_LEVEL = config.getfloat("ADAPTIVE","SOUND_NOISE_LEVEL", fallback=0)
+        if self.ENABLE_ADAPTIVE:
+            if not 0 < self.FAST_SCAN_PERIOD <= self.SCAN_PERIOD:
+                raise ValueError("FAST_SCAN_PERIOD must be > 0 and <= SCAN_PERIOD: {}".format(self.FAST_SCAN_PERIOD))
+            if not self.DECAY_FACTOR > 1:
+                raise ValueError("DECAY_FACTOR must be > 1: {}".format(self.DECAY_FACTOR))
+        # Rate of change thresholds per channel (unit/sec)
+        self.RATE_THRESHOLDS = {}
+        if self.ENABLE_ADAPTIVE and config.has_section("ADAPTIVE_THRESHOLD"):
+            # Numeric channels only
+            channels = {h.lower(): h for h in Headers_short if h != "Time measured"}
+            for key, value in config.items("ADAPTIVE_THRESHOLD"):
+                if key not in channels:
+                    raise ValueError("Unknown channel in ADAPTIVE_THRESHOLD: {}".format(key))
+                try:
+                    threshold = float(value)
+                except ValueError:
+                    raise ValueError("Invalid threshold in ADAPTIVE_THRESHOLD: {} = {}".format(key, value))
+                if not threshold > 0:
+                    raise ValueError("Threshold must be > 0 in ADAPTIVE_THRESHOLD: {} = {}".format(key, value))
+                self.RATE_THRESHOLDS[channels[key]] = threshold
         # Create filename
         self.LOG_FILE = self.LOG_DIR + self.HOSTNAME + "-sensor.log"
         self.CSV_FILE = self.CSV_DIR + self.HOSTNAME + "-sensor.csv"
@@ -108,7 +134,7 @@ def write_csv_short(filepath, data):
 """
 Prometheus exporter
 """
-def write_prom_registry(data):
+def write_prom_registry(data, scan_interval=None, scan_count=None):
     
     # Prepare prometheus registry
     registry = CollectorRegistry()
@@ -141,8 +167,84 @@ def write_prom_registry(data):
     g_pga.set(data["PGA"])
     g_seismic_intensity.set(data["Seismic intensity"])
     
+    # Total number of scans, use rate()/increase() to get scan rate
+    if scan_count is not None:
+        c_scans = Counter('scans', 'Number of scans', registry=registry)
+        c_scans.inc(scan_count)
+    
+    # Effective scan rate (Hz) measured between last two scans
+    if scan_interval:
+        g_scan_rate = Gauge('scan_rate', 'Effective scan rate', registry=registry)
+        g_scan_rate.set(1 / scan_interval)
+    
     return registry
 
+"""
+Adaptive scan scheduler
+"""
+class AdaptiveScheduler():
+    """
+    Switch to FAST_SCAN_PERIOD when an event is detected, then decay
+    back to SCAN_PERIOD by DECAY_FACTOR per scan.
+    Rate of change is measured against a reference sample at least
+    SCAN_PERIOD old, so it does not depend on the current scan period.
+    """
+    def __init__(self, conf):
+        self.conf = conf
+        self.period = conf.SCAN_PERIOD
+        # Number of scans and measured interval between scans (sec)
+        self.count = 0
+        self.interval = None
+        self.last_time = None
+        self.ref_data = None
+        self.ref_time = None
+        # Result of the last rate of change evaluation
+        self.rate_event = False
+
+    def is_rate_event(self, data, now):
+        if self.ref_data is None:
+            self.ref_data = data
+            self.ref_time = now
+            return False
+        elapsed = now - self.ref_time
+        if elapsed < self.conf.SCAN_PERIOD:
+            # Hold last result until the window elapses
+            return self.rate_event
+        self.rate_event = False
+        for channel, threshold in self.conf.RATE_THRESHOLDS.items():
+            rate = abs(float(data[channel]) - float(self.ref_data[channel])) / elapsed
+            if rate >= threshold:
+                self.rate_event = True
+        self.ref_data = data
+        self.ref_time = now
+        return self.rate_event
+
+    def is_event(self, data, now):
+        # Always update reference sample
+        event = self.is_rate_event(data, now)
+        # Vibration information: 0 none, 1 vibration, 2 earthquake
+        if self.conf.VIBRATION_TRIGGER and int(data["Vibration information"]) > 0:
+            return True
+        if self.conf.SOUND_NOISE_LEVEL and float(data["Sound noise"]) >= self.conf.SOUND_NOISE_LEVEL:
+            return True
+        return event
+
+    def update(self, data, now):
+        """
+        Update scan period with latest data and return it (sec).
+        """
+        self.count += 1
+        if self.last_time is not None:
+            self.interval = now - self.last_time
+        self.last_time = now
+        if not self.conf.ENABLE_ADAPTIVE:
+            return self.period
+        if self.is_event(data, now):
+            self.period = self.conf.FAST_SCAN_PERIOD
+        else:
+            self.period = min(self.period * self.conf.DECAY_FACTOR, self.conf.SCAN_PERIOD)
+        return self.period
+
 
 """
 Sensor Util
@@ -0,0 +1,175 @@
+import os, configparser
+import pytest
+from types import SimpleNamespace
+import omron_sensor_util
+
+"""
+Adaptive scan scheduler
+"""
+def make_conf(**kwargs):
+    conf = SimpleNamespace(ENABLE_ADAPTIVE=True,
+                           SCAN_PERIOD=1.0,
+                           FAST_SCAN_PERIOD=0.2,
+                           DECAY_FACTOR=1.5,
+                           VIBRATION_TRIGGER=True,
+                           SOUND_NOISE_LEVEL=0,
+                           RATE_THRESHOLDS={})
+    for key, value in kwargs.items():
+        setattr(conf, key, value)
+    return conf
+
+def make_data(ambient_light=500, sound_noise=40.0, vibration=0):
+    return {"Time measured": "2023/01/30 14:55:06",
+            "Ambient light": str(ambient_light),
+            "Sound noise": str(sound_noise),
+            "Vibration information": str(vibration)}
+
+def run_scheduler(scheduler, count, sample):
+    # sample: function(index, time) -> data
+    periods = []
+    now = 0.0
+    for i in range(count):
+        period = scheduler.update(sample(i, now), now)
+        periods.append(period)
+        now += period
+    return periods
+
+def test_vibration_trigger():
+    scheduler = omron_sensor_util.AdaptiveScheduler(make_conf())
+    assert scheduler.update(make_data(), 0.0) == 1.0
+    assert scheduler.update(make_data(vibration=1), 1.0) == 0.2
+
+def test_vibration_trigger_disabled():
+    scheduler = omron_sensor_util.AdaptiveScheduler(make_conf(VIBRATION_TRIGGER=False))
+    assert scheduler.update(make_data(vibration=2), 0.0) == 1.0
+
+def test_sound_noise_level_trigger():
+    scheduler = omron_sensor_util.AdaptiveScheduler(make_conf(SOUND_NOISE_LEVEL=70))
+    assert scheduler.update(make_data(sound_noise=69.9), 0.0) == 1.0
+    assert scheduler.update(make_data(sound_noise=75.0), 1.0) == 0.2
+
+def test_rate_trigger():
+    conf = make_conf(RATE_THRESHOLDS={"Ambient light": 100.0})
+    scheduler = omron_sensor_util.AdaptiveScheduler(conf)
+    assert scheduler.update(make_data(ambient_light=500), 0.0) == 1.0
+    assert scheduler.update(make_data(ambient_light=550), 1.0) == 1.0
+    assert scheduler.update(make_data(ambient_light=800), 2.0) == 0.2
+
+def test_rate_trigger_holds_while_active():
+    conf = make_conf(RATE_THRESHOLDS={"Ambient light": 100.0})
+    scheduler = omron_sensor_util.AdaptiveScheduler(conf)
+    # Ramp 200 lx/sec until 5 sec, then steady
+    periods = run_scheduler(scheduler, 40,
+                            lambda i, now: make_data(ambient_light=int(500 + 200 * min(now, 5.0))))
+    times = [sum(periods[:i]) for i in range(len(periods))]
+    ramp = [p for t, p in zip(times, periods) if 1.0 < t < 5.0]
+    assert ramp and ramp == [0.2] * len(ramp)
+    assert periods[-1] == 1.0
+
+def test_decay_back_to_scan_period():
+    # Steady drift below threshold must not latch fast mode after an event
+    conf = make_conf(RATE_THRESHOLDS={"Ambient light": 3.0})
+    scheduler = omron_sensor_util.AdaptiveScheduler(conf)
+    periods = run_scheduler(scheduler, 40,
+                            lambda i, now: make_data(ambient_light=int(2 * now),
+                                                     vibration=1 if i == 5 else 0))
+    assert periods[5] == 0.2
+    assert periods[6:9] == sorted(periods[6:9])
+    assert periods[9:] == [1.0] * len(periods[9:])
+
+def test_disabled_returns_scan_period():
+    conf = make_conf(ENABLE_ADAPTIVE=False, SOUND_NOISE_LEVEL=70,
+                     RATE_THRESHOLDS={"Ambient light": 1.0})
+    scheduler = omron_sensor_util.AdaptiveScheduler(conf)
+    periods = run_scheduler(scheduler, 10,
+                            lambda i, now: make_data(ambient_light=i * 1000,
+                                                     sound_noise=90, vibration=1))
+    assert periods == [1.0] * 10
+
+def test_measured_interval():
+    scheduler = omron_sensor_util.AdaptiveScheduler(make_conf(ENABLE_ADAPTIVE=False))
+    scheduler.update(make_data(), 10.0)
+    assert scheduler.interval is None
+    scheduler.update(make_data(), 11.5)
+    assert scheduler.interval == 1.5
+
+def test_scan_count():
+    scheduler = omron_sensor_util.AdaptiveScheduler(make_conf())
+    run_scheduler(scheduler, 5, lambda i, now: make_data())
+    assert scheduler.count == 5
+
+"""
+Config
+"""
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config-sample.ini')
+
+def load_config(tmp_path, monkeypatch, adaptive=None, thresholds=None, scan_period=None):
+    # Write config.ini based on config-sample.ini, then load it by Config
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read(SAMPLE_CONFIG, 'UTF-8')
+    if scan_period is not None:
+        config["SENSOR"]["SCAN_PERIOD"] = scan_period
+    for key, value in (adaptive or {}).items():
+        config["ADAPTIVE"][key] = value
+    if thresholds is not None:
+        config.remove_section("ADAPTIVE_THRESHOLD")
+        config.add_section("ADAPTIVE_THRESHOLD")
+        for key, value in thresholds.items():
+            config["ADAPTIVE_THRESHOLD"][key] = value
+    with open(tmp_path / 'config.ini', 'w') as f:
+        config.write(f)
+    monkeypatch.setattr(omron_sensor_util, '__file__', str(tmp_path / 'omron_sensor_util.py'))
+    return omron_sensor_util.Config()
+
+def test_config_adaptive_enabled(tmp_path, monkeypatch):
+    conf = load_config(tmp_path, monkeypatch, adaptive={"ENABLE_ADAPTIVE": "True"})
+    assert conf.FAST_SCAN_PERIOD == 0.2
+    assert conf.RATE_THRESHOLDS == {"Sound noise": 10.0, "Ambient light": 100.0}
+
+def test_config_adaptive_disabled_skips_validation(tmp_path, monkeypatch):
+    # Sample FAST_SCAN_PERIOD 0.2 > SCAN_PERIOD 0.1
+    conf = load_config(tmp_path, monkeypatch, scan_period="0.1",
+                       thresholds={"Time measured": "1"})
+    assert not conf.ENABLE_ADAPTIVE
+    assert conf.RATE_THRESHOLDS == {}
+
+@pytest.mark.parametrize("adaptive, message", [
+    ({"FAST_SCAN_PERIOD": "2"}, "FAST_SCAN_PERIOD"),
+    ({"FAST_SCAN_PERIOD": "0"}, "FAST_SCAN_PERIOD"),
+    ({"DECAY_FACTOR": "1"}, "DECAY_FACTOR"),
+    ({"DECAY_FACTOR": "0.9"}, "DECAY_FACTOR"),
+])
+def test_config_invalid_adaptive(tmp_path, monkeypatch, adaptive, message):
+    adaptive["ENABLE_ADAPTIVE"] = "True"
+    with pytest.raises(ValueError, match=message):
+        load_config(tmp_path, monkeypatch, adaptive=adaptive)
+
+@pytest.mark.parametrize("thresholds, message", [
+    ({"Unknown": "1"}, "Unknown channel"),
+    ({"Time measured": "1"}, "Unknown channel"),
+    ({"Sound noise": "loud"}, "Invalid threshold"),
+    ({"Sound noise": "0"}, "must be > 0"),
+    ({"Sound noise": "-1"}, "must be > 0"),
+])
+def test_config_invalid_threshold(tmp_path, monkeypatch, thresholds, message):
+    with pytest.raises(ValueError, match=message):
+        load_config(tmp_path, monkeypatch, adaptive={"ENABLE_ADAPTIVE": "True"},
+                    thresholds=thresholds)
+
+"""
+Prometheus exporter
+"""
+def make_full_data():
+    return {h: "1" for h in omron_sensor_util.Headers_short if h != "Time measured"}
+
+def test_prom_registry_scan_metrics():
+    registry = omron_sensor_util.write_prom_registry(make_full_data(), 0.5, 42)
+    assert registry.get_sample_value('scan_rate') == 2.0
+    assert registry.get_sample_value('scans_total') == 42
+
+def test_prom_registry_without_scan_metrics():
+    registry = omron_sensor_util.write_prom_registry(make_full_data())
+    assert registry.get_sample_value('scan_rate') is None
+    assert registry.get_sample_value('scans_total') is None
+    assert registry.get_sample_value('temperature') == 1.0